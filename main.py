@@ -1,7 +1,9 @@
 import pandas as pd
 
-from pandas_profiling import ProfileReport
+from ydata_profiling import ProfileReport
 
-df = pd.read_csv('data.csv')
-profile = ProfileReport(df, title='Profiling Report')
-profile.to_file("output.html")
\ No newline at end of file
+if __name__ == "__main__":
+    df = pd.read_csv('data.csv')
+    # minimal=True desativa as correlações e interações (as etapas mais caras do relatório)
+    profile = ProfileReport(df, title='Profiling Report', minimal=True)
+    profile.to_file("output.html")
@@ -1,10 +1,45 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import numpy as np
+import hashlib
+
+# --- TIPOS DAS COLUNAS NA LEITURA ---
+
+# Ordem de exibição dos dias da semana nos gráficos
+DIAS_ORDEM = ['Segunda-Feira', 'Terça-Feira', 'Quarta-Feira', 'Quinta-Feira', 'Sexta-Feira', 'Sábado', 'Domingo']
+
+# Colunas de texto com poucos valores distintos são lidas como 'category' (agrupamentos
+# e filtros passam a operar sobre códigos inteiros) e Conversions como float32, reduzindo
+# a memória ocupada pelo DataFrame. Amount_spent permanece float64: somas de valores
+# monetários em float32 perdem precisão já na casa de centenas de milhares de linhas.
+DTYPE_MAP = {
+    'Ano_Mes': 'category',
+    'Dia_da_Semana': 'category',
+    'Tipo_Dia': 'category',
+    'Objetivo': 'category',
+    'AdSet_name': 'category',
+    'Segmentação': 'category',
+    'Tipo_de_Anúncio': 'category',
+    'Fase': 'category',
+    'Conversions': 'float32',
+}
+
+# Colunas necessárias para os agrupamentos focados em Leads
+LEADS_COLUMNS = ['Dia_da_Semana', 'AdSet_name', 'Tipo_de_Anúncio', 'Conversions', 'Amount_spent']
 
 # --- FUNÇÕES DE PRÉ-PROCESSAMENTO E CÁLCULO ---
 
+def read_csv_fast(uploaded_file) -> pd.DataFrame:
+    """
+    Lê o CSV com o engine 'pyarrow' (parser multithread, mais rápido que o engine C
+    padrão) e converte as colunas presentes no arquivo para os tipos de DTYPE_MAP.
+    """
+    df = pd.read_csv(uploaded_file, engine='pyarrow')
+    # O mapa é aplicado após a leitura porque o engine 'pyarrow' não aceita tipos para
+    # colunas ausentes no arquivo (ex: 'Segmentação' nos CSVs de 2025).
+    return df.astype({col: dtype for col, dtype in DTYPE_MAP.items() if col in df.columns})
+
+
 @st.cache_data
 def load_and_prepare_data(uploaded_file):
     """
@@ -12,8 +47,18 @@ def load_and_prepare_data(uploaded_file):
     e calcula o Custo Por Aquisição (CPA) por linha.
     """
     
-    # Leitura do arquivo
-    df = pd.read_csv(uploaded_file)
+    # Leitura do arquivo com os tipos otimizados
+    df = read_csv_fast(uploaded_file)
+    
+    # 'Dia_da_Semana' vira uma categoria ordenada, de modo que os agrupamentos por dia
+    # já saem na ordem da semana. Valores fora de DIAS_ORDEM viram nulos e são ignorados
+    # nos agrupamentos.
+    df['Dia_da_Semana'] = df['Dia_da_Semana'].cat.set_categories(DIAS_ORDEM, ordered=True)
+    
+    # Normaliza o 'Objetivo' para minúsculas uma única vez, para que o filtro de Leads
+    # seja uma comparação direta. O acessor .str de uma coluna categórica opera sobre as
+    # categorias (e não sobre cada linha), e variações como 'Leads'/'leads' são unificadas.
+    df['Objetivo'] = df['Objetivo'].str.lower().astype('category')
     
     # Preenchimento de nulos: 'Conversions' e 'Amount_spent' são definidos como 0
     # para permitir o cálculo agregado correto.
@@ -22,69 +67,108 @@ def load_and_prepare_data(uploaded_file):
     
     # Cálculo do CPA (Custo Por Aquisição/Conversão).
     # O CPA é calculado apenas onde há conversões (> 0).
-    # Se Conversions for 0, usamos NaN para evitar divisão por zero e não distorcer o CPA médio.
-    df['CPA'] = np.where(
-        df['Conversions'] > 0,
-        df['Amount_spent'] / df['Conversions'],
-        np.nan 
-    )
+    # Conversões não positivas viram NaN antes da divisão: não há divisão por zero e
+    # essas linhas ficam com CPA NaN, sem distorcer o CPA médio.
+    conversions = df['Conversions'].where(df['Conversions'] > 0)
+    df['CPA'] = df['Amount_spent'].div(conversions)
     
     return df
 
 @st.cache_data
-def calculate_kpis_and_groups(df):
-    """Calcula KPIs essenciais globais e gera tabelas de agregação para gráficos."""
+def calculate_kpis(df):
+    """Calcula KPIs essenciais globais."""
     
-    # 1. Agregações Globais
     total_spent = df['Amount_spent'].sum()
     total_conversions = df['Conversions'].sum()
     
     # CPA médio (ignora os valores 'NaN' ao calcular a média)
     average_cpa = df['CPA'].mean()
     
-    kpis = {
+    return {
         "Total Gasto": total_spent,
         "Total Conversões": total_conversions,
         "CPA Médio": average_cpa
     }
-    
-    # 2. Agrupamento para Gráfico Temporal (Gasto e Conversão por Ano/Mês)
-    df_by_month = df.groupby('Ano_Mes').agg(
+
+# --- AGREGAÇÕES PARA OS GRÁFICOS ---
+# Cada agregação fica em cache: o Streamlit re-executa o script a cada interação,
+# mas os agrupamentos só são recalculados quando os dados de entrada mudam.
+# As chaves são categóricas: observed=True ignora categorias sem linhas e sort=False
+# dispensa a ordenação das chaves quando a ordem de exibição é definida depois.
+
+@st.cache_data
+def compute_by_month(df):
+    """Gasto e Conversões por Ano/Mês (gráficos temporais)."""
+    return df.groupby('Ano_Mes', observed=True).agg(
         Total_Gasto=('Amount_spent', 'sum'),
         Total_Conversões=('Conversions', 'sum')
     ).reset_index()
-    
-    return kpis, df_by_month
+
+@st.cache_data
+def compute_by_weekday(df_leads):
+    """Conversões (Leads) por Dia da Semana, já na ordem da semana (categoria ordenada)."""
+    return df_leads.groupby('Dia_da_Semana', observed=True, sort=True).agg(
+        Total_Leads=('Conversions', 'sum')
+    ).reset_index()
+
+@st.cache_data
+def compute_by_adset(df_leads):
+    """Leads e Gasto por Grupo de Anúncio (AdSet)."""
+    return df_leads.groupby('AdSet_name', observed=True, sort=False).agg(
+        Total_Leads=('Conversions', 'sum'),
+        Total_Gasto=('Amount_spent', 'sum')
+    ).reset_index()
+
+@st.cache_data
+def compute_by_type(df_leads):
+    """Leads por Tipo de Anúncio (Criativo)."""
+    return df_leads.groupby('Tipo_de_Anúncio', observed=True, sort=False).agg(
+        Total_Leads=('Conversions', 'sum')
+    ).reset_index()
+
+# --- CONSTRUÇÃO DOS GRÁFICOS ---
+
+def frame_key(df):
+    """Chave de cache de um DataFrame: hash do conteúdo das linhas, na ordem em que aparecem."""
+    row_hashes = pd.util.hash_pandas_object(df).to_numpy()
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()
+
+@st.cache_resource(max_entries=64)
+def build_figure(df_key, _df, chart, layout=None, **chart_kwargs):
+    """
+    Constrói a figura Plotly Express `chart` (ex: 'bar', 'line') a partir de `_df` e a
+    mantém em cache entre as re-execuções. O Streamlit não faz hash de `_df` (prefixo '_'):
+    a figura é identificada por `df_key` (ver frame_key) e pelos parâmetros do gráfico.
+    """
+    fig = getattr(px, chart)(_df, **chart_kwargs)
+    if layout:
+        fig.update_layout(**layout)
+    return fig
 
 # --- FUNÇÃO PRINCIPAL DE CONSTRUÇÃO DO DASHBOARD ---
 
 def create_dashboard(df_clean):
     st.header("📊 Dashboard de Insights de Performance")
     
-    # 1. Filtragem para Análise Focada em Leads (Onde a coluna 'Objetivo' contém 'leads')
-    df_leads = df_clean[df_clean['Objetivo'].astype(str).str.lower() == 'leads'].copy()
+    # 1. Filtragem para Análise Focada em Leads ('Objetivo' já normalizado em minúsculas)
+    # Apenas leitura a partir daqui, portanto não é necessário copiar o recorte.
+    # Mantém só as colunas usadas nos agrupamentos de Leads, para que cada agrupamento
+    # percorra apenas os dados necessários.
+    leads_mask = df_clean['Objetivo'].eq('leads')
+    df_leads = df_clean.loc[leads_mask, LEADS_COLUMNS]
     
     # 2. Cálculo de KPIs Globais e Agrupamentos Temporais
-    kpis, df_by_month = calculate_kpis_and_groups(df_clean)
+    kpis = calculate_kpis(df_clean)
+    df_by_month = compute_by_month(df_clean)
     
     # --- Agrupamentos Específicos de Leads ---
-    
-    # Conversões (Leads) por Dia da Semana
-    df_by_weekday = df_leads.groupby('Dia_da_Semana').agg(
-        Total_Leads=('Conversions', 'sum')
-    ).reset_index()
-    
-    # Leads e Gasto por Grupo de Anúncio (AdSet)
-    df_by_adset = df_leads.groupby('AdSet_name').agg(
-        Total_Leads=('Conversions', 'sum'),
-        Total_Gasto=('Amount_spent', 'sum')
-    ).reset_index()
+    df_by_weekday = compute_by_weekday(df_leads)
+    df_by_adset = compute_by_adset(df_leads)
     
     # Top 15 AdSets por Conversão para visualização
-    df_by_adset_sorted = df_by_adset.sort_values(by='Total_Leads', ascending=False).head(15)
+    df_by_adset_sorted = df_by_adset.nlargest(15, 'Total_Leads')
     
-    # Leads por Tipo de Anúncio (Criativo)
-    df_leads_by_type = df_leads.groupby('Tipo_de_Anúncio').agg(Total_Leads=('Conversions', 'sum')).reset_index()
+    df_leads_by_type = compute_by_type(df_leads)
     
     # --- Exibição de KPIs ---
 
@@ -105,25 +189,26 @@ def create_dashboard(df_clean):
 
     # GRÁFICO 1: Gasto Total por Mês
     st.subheader("1. Análise de Investimento Temporal")
-    fig_month_spent = px.bar(
-        df_by_month, 
+    month_key = frame_key(df_by_month)
+    fig_month_spent = build_figure(
+        month_key, df_by_month, 'bar',
         x='Ano_Mes', 
         y='Total_Gasto', 
         title='Gasto Total por Mês (R$)',
-        labels={'Total_Gasto': 'Gasto (R$)'}
+        labels={'Total_Gasto': 'Gasto (R$)'},
+        layout={'xaxis_tickangle': -45}
     )
-    fig_month_spent.update_layout(xaxis_tickangle=-45)
     st.plotly_chart(fig_month_spent, use_container_width=True)
 
     # GRÁFICO 2: Evolução de Conversões por Mês
-    fig_month_conversions = px.line(
-        df_by_month, 
+    fig_month_conversions = build_figure(
+        month_key, df_by_month, 'line',
         x='Ano_Mes', 
         y='Total_Conversões', 
         title='Evolução do Número de Conversões por Mês',
-        markers=True # Adiciona marcadores para clareza
+        markers=True, # Adiciona marcadores para clareza
+        layout={'xaxis_tickangle': -45}
     )
-    fig_month_conversions.update_layout(xaxis_tickangle=-45)
     st.plotly_chart(fig_month_conversions, use_container_width=True)
     
     st.markdown("---")
@@ -131,15 +216,9 @@ def create_dashboard(df_clean):
     # GRÁFICO 3: Leads por Dia da Semana (Filtro 'Leads')
     st.subheader("2. Performance por Dia da Semana (Foco em Leads)")
     
-    dias_ordem = ['Segunda-Feira', 'Terça-Feira', 'Quarta-Feira', 'Quinta-Feira', 'Sexta-Feira', 'Sábado', 'Domingo']
-    
     if not df_by_weekday.empty:
-        # Ordena os dias da semana corretamente
-        df_by_weekday['Dia_da_Semana'] = pd.Categorical(df_by_weekday['Dia_da_Semana'], categories=dias_ordem, ordered=True)
-        df_by_weekday_sorted = df_by_weekday.sort_values('Dia_da_Semana').dropna(subset=['Dia_da_Semana'])
-        
-        fig_weekday_leads = px.bar(
-            df_by_weekday_sorted, 
+        fig_weekday_leads = build_figure(
+            frame_key(df_by_weekday), df_by_weekday, 'bar',
             x='Dia_da_Semana', 
             y='Total_Leads', 
             title='Número de Leads por Dia da Semana',
@@ -154,8 +233,8 @@ def create_dashboard(df_clean):
     # GRÁFICO 4: Leads por Tipo de Anúncio (Criativo)
     st.subheader("3. Análise por Tipo de Criativo (Foco em Leads)")
     
-    fig_type_leads = px.bar(
-        df_leads_by_type, 
+    fig_type_leads = build_figure(
+        frame_key(df_leads_by_type), df_leads_by_type, 'bar',
         y='Tipo_de_Anúncio', 
         x='Total_Leads', 
         orientation='h',
@@ -167,27 +246,27 @@ def create_dashboard(df_clean):
     # GRÁFICO 5: Top 15 AdSets por Leads
     st.subheader("4. Top 15 Grupos de Anúncio (AdSets) por Leads")
     
-    fig_adset_leads = px.bar(
-        df_by_adset_sorted, 
+    fig_adset_leads = build_figure(
+        frame_key(df_by_adset_sorted), df_by_adset_sorted, 'bar',
         x='Total_Leads', 
         y='AdSet_name', 
         orientation='h',
         title='Top 15 AdSets por Total de Leads',
-        hover_data=['Total_Gasto', 'Total_Leads']
+        hover_data=['Total_Gasto', 'Total_Leads'],
+        # Ordena o eixo Y pela contagem total de Leads (ascendente)
+        layout={'yaxis': {'categoryorder': 'total ascending'}}
     )
-    # Ordena o eixo Y pela contagem total de Leads (ascendente)
-    fig_adset_leads.update_layout(yaxis={'categoryorder':'total ascending'}) 
     st.plotly_chart(fig_adset_leads, use_container_width=True)
 
     # GRÁFICO 6: Distribuição do CPA Geral
     st.subheader("5. Qualidade de Custo (Distribuição do CPA)")
     
-    # Filtra apenas linhas com CPA válido (onde houve conversão)
-    df_cpa_valid = df_clean[df_clean['CPA'].notna()]
+    # Filtra apenas linhas com CPA válido (onde houve conversão); o histograma só usa o CPA
+    df_cpa_valid = df_clean.loc[df_clean['CPA'].notna(), ['CPA']]
     
     if not df_cpa_valid.empty:
-        fig_cpa = px.histogram(
-            df_cpa_valid,
+        fig_cpa = build_figure(
+            frame_key(df_cpa_valid), df_cpa_valid, 'histogram',
             x='CPA',
             nbins=15,
             title='Distribuição do Custo Por Conversão (CPA)'
@@ -1,85 +1,35 @@
 import streamlit as st
 import pandas as pd
-from pydantic import ValidationError
 import time
 
-# Importa o modelo de validação Pydantic que define o esquema de dados esperado.
-from validator import AdPerformanceRecord
+# Regras de validação compartilhadas (modelo Pydantic + pré-filtro vetorizado)
+from validation_core import validate_csv_chunks
 
-def format_pydantic_error(error_detail: dict) -> str:
+# Número máximo de registros válidos exibidos na tabela de visualização
+PREVIEW_VALID_ROWS = 1000
+
+
+@st.cache_data
+def load_preview(uploaded_file, n_rows: int = 5) -> pd.DataFrame:
     """
-    Formata um detalhe de erro do Pydantic (dicionário de erro) para uma mensagem amigável 
-    e legível pelo usuário, em português.
+    Lê apenas as primeiras linhas do CSV carregado para a amostra exibida na página.
+    O resultado fica em cache (o Streamlit identifica o arquivo pelo nome e conteúdo).
     """
-    # Tenta obter o nome do campo que causou o erro
-    field = error_detail.get("loc", ["Campo Desconhecido"])[0]
-    # Obtém a mensagem de erro original do Pydantic
-    msg = error_detail.get("msg", "Erro de validação genérico.")
-    
-    # Lógica de formatação para erros comuns:
-    if "field required" in msg:
-        return f"O campo '{field}' está faltando ou vazio."
-    if "float" in msg and ("not a valid float" in msg or "value is not a valid float" in msg):
-        return f"O campo '{field}' deve ser um número decimal (ex: 100.50)."
-    if "int" in msg and "not a valid integer" in msg:
-        return f"O campo '{field}' deve ser um número inteiro (ex: 100)."
-    
-    # Mensagem padrão para outros erros não mapeados
-    return f"Campo '{field}': {msg.capitalize()}."
+    uploaded_file.seek(0)
+    df_preview = pd.read_csv(uploaded_file, nrows=n_rows)
+    # Volta ao início para que a validação leia o arquivo completo
+    uploaded_file.seek(0)
+    return df_preview
 
 
-def validate_data(df: pd.DataFrame):
+@st.cache_data
+def validate_csv(uploaded_file):
     """
-    Itera sobre o DataFrame, valida cada linha usando o modelo Pydantic 
-    (AdPerformanceRecord) e gera um relatório detalhado de erros.
-
-    Retorna:
-    - valid_records (list): Lista de dicionários das linhas que passaram na validação.
-    - error_report_list (list): Lista de dicionários com informações formatadas sobre os erros.
+    Valida o CSV carregado em blocos (ver validation_core.validate_csv_chunks).
+    O resultado fica em cache: o arquivo só é validado de novo se o conteúdo mudar.
     """
-    valid_records = []
-    error_report_list = []
-    
-    # Itera sobre as linhas do DataFrame para validação individual
-    for index, row in df.iterrows():
-        try:
-            # Converte a linha do pandas (Series) para um dicionário Python
-            record_dict = row.to_dict()
-            
-            # Tenta validar o registro contra o modelo Pydantic
-            validated_record = AdPerformanceRecord(**record_dict)
-            
-            # Se não houver exceção, o registro é válido
-            valid_records.append(record_dict)
-            
-        except ValidationError as e:
-            # Captura erros de validação Pydantic
-            
-            # Gera uma lista de mensagens de erro formatadas para a linha atual
-            formatted_errors = [
-                format_pydantic_error(error) 
-                for error in e.errors()
-            ]
-            
-            # Adiciona o registro de erro ao relatório
-            error_report_list.append({
-                # A linha CSV é o índice pandas + 2 (assumindo que o índice 0 é a linha 1 do cabeçalho)
-                "Linha_CSV": index + 2, 
-                "AdSet_Nome_Aprox": record_dict.get('AdSet_name', 'N/A'),
-                "Primeiro_Erro_Detectado": formatted_errors[0],
-                "Total_Erros_Nesta_Linha": len(formatted_errors)
-            })
-            
-        except Exception as e:
-            # Captura outros erros inesperados (ex: problemas de codificação na leitura da linha)
-            error_report_list.append({
-                "Linha_CSV": index + 2,
-                "AdSet_Nome_Aprox": row.get('AdSet_name', 'N/A'),
-                "Primeiro_Erro_Detectado": f"Erro Geral: {str(e)}",
-                "Total_Erros_Nesta_Linha": 1
-            })
-            
-    return valid_records, error_report_list
+    uploaded_file.seek(0)
+    return validate_csv_chunks(uploaded_file, preview_rows=PREVIEW_VALID_ROWS)
 
 # --- Configuração e Layout do Streamlit ---
 st.set_page_config(
@@ -100,26 +50,24 @@ uploaded_file = st.file_uploader(
 if uploaded_file is not None:
     # 1. Leitura do arquivo CSV usando pandas
     try:
-        # Tenta ler o CSV
-        df = pd.read_csv(uploaded_file)
+        # Tenta ler o início do CSV (em cache entre as re-execuções do Streamlit).
+        # O arquivo completo só é lido, em blocos, durante a validação.
+        df_preview = load_preview(uploaded_file)
         
         st.subheader("Dados Carregados (Amostra)")
         st.write(f"Arquivo: **{uploaded_file.name}**")
-        st.write(f"Total de Linhas Lidas: **{len(df)}**")
         # Exibe as primeiras 5 linhas para visualização
-        st.dataframe(df.head(5), use_container_width=True)
+        st.dataframe(df_preview, use_container_width=True)
         
         # Botão para iniciar o processo de validação
         if st.button("▶️ 2. Iniciar Validação e Relatório", type="primary"):
-            st.info("Iniciando a validação linha a linha... Por favor, aguarde.")
+            st.info("Iniciando a validação do arquivo em blocos... Por favor, aguarde.")
             
             # 2. Execução da Validação
             start_time = time.time()
-            valid_data, error_report = validate_data(df)
+            total_records, valid_count, valid_preview, error_report = validate_csv(uploaded_file)
             end_time = time.time()
             
-            total_records = len(df)
-            valid_count = len(valid_data)
             error_count = len(error_report)
             
             st.subheader("Resumo da Validação")
@@ -138,10 +86,9 @@ if uploaded_file is not None:
                 st.markdown("### Relatório de Erros Amigável")
                 st.warning("Use a tabela abaixo para identificar e corrigir rapidamente os dados incorretos no seu CSV original.")
                 
-                # Converte o relatório de erro para um DataFrame para exibição tabular
-                df_errors = pd.DataFrame(error_report)
+                # O relatório de erro já é um DataFrame pronto para exibição tabular
                 st.dataframe(
-                    df_errors,
+                    error_report,
                     use_container_width=True,
                     hide_index=True
                 )
@@ -151,9 +98,11 @@ if uploaded_file is not None:
                 
             # 4. Exibição dos Dados Válidos (opcional, em um expander)
             with st.expander(f"Visualizar os {valid_count} Registros Válidos"):
-                if valid_data:
-                    df_valid = pd.DataFrame(valid_data)
-                    st.dataframe(df_valid, use_container_width=True)
+                if valid_count > 0:
+                    # Exibe apenas o início: não é viável navegar por milhões de linhas na tela
+                    st.dataframe(valid_preview, use_container_width=True)
+                    if valid_count > PREVIEW_VALID_ROWS:
+                        st.caption(f"Exibindo os primeiros {PREVIEW_VALID_ROWS} de {valid_count} registros válidos.")
                 else:
                     st.warning("Nenhum dado válido para exibir (todas as linhas tiveram erro).")
 
@@ -0,0 +1,267 @@
+import pandas as pd
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+from collections import defaultdict
+from functools import lru_cache
+
+# Importa o modelo de validação Pydantic que define o esquema de dados esperado.
+from validator import AdPerformanceRecord
+
+# Valida uma lista inteira de registros em uma única chamada ao núcleo do Pydantic
+ADAPTER = TypeAdapter(list[AdPerformanceRecord])
+
+# Mensagens amigáveis por código de erro do Pydantic v2. O campo 'type' do erro é um
+# identificador estável, ao contrário do texto de 'msg', e permite uma busca direta.
+TYPE_FORMATTERS = {
+    'missing': lambda field: f"O campo '{field}' está faltando ou vazio.",
+    'float_parsing': lambda field: f"O campo '{field}' deve ser um número decimal (ex: 100.50).",
+    'int_parsing': lambda field: f"O campo '{field}' deve ser um número inteiro (ex: 100).",
+    'int_from_float': lambda field: f"O campo '{field}' deve ser um número inteiro (ex: 100).",
+}
+
+
+@lru_cache(maxsize=1024)
+def _format_message(error_type: str, field: str, msg: str) -> str:
+    """Monta a mensagem para um tipo de erro e campo (em cache, pois se repetem muito)."""
+    formatter = TYPE_FORMATTERS.get(error_type)
+    if formatter is not None:
+        return formatter(field)
+    
+    # Mensagem padrão para outros erros não mapeados
+    return f"Campo '{field}': {msg.capitalize()}."
+
+
+def format_pydantic_error(error_detail: dict) -> str:
+    """
+    Formata um detalhe de erro do Pydantic (dicionário de erro) para uma mensagem amigável 
+    e legível pelo usuário, em português.
+    """
+    # Tenta obter o nome do campo que causou o erro
+    field = (error_detail.get("loc") or ["Campo Desconhecido"])[0]
+    # Obtém a mensagem de erro original do Pydantic
+    msg = error_detail.get("msg", "Erro de validação genérico.")
+    
+    return _format_message(error_detail.get("type"), field, msg)
+
+
+# --- REGRAS VETORIZADAS DO CONTRATO ---
+
+# Campos de texto obrigatórios do modelo AdPerformanceRecord
+REQUIRED_STR = ['Ano_Mes', 'Dia_da_Semana', 'Tipo_Dia', 'Objetivo', 'Date', 'AdSet_name', 'Tipo_de_Anúncio', 'Fase']
+# Campos numéricos obrigatórios e o tipo esperado de cada um
+REQUIRED_NUM = {'Organizador': int, 'Amount_spent': float}
+# Campos numéricos opcionais (podem estar vazios, mas se preenchidos devem ser números)
+OPTIONAL_NUM = ['Link_clicks', 'Impressions', 'Conversions']
+# Campos de texto opcionais (podem estar vazios, mas se preenchidos devem ser texto)
+OPTIONAL_STR = ['Segmentação']
+# Campos que não podem ser negativos (ge=0.0 no modelo)
+NON_NEGATIVE = ['Amount_spent']
+# Campos verificados pelo pré-filtro; o bit i do código de erro corresponde a MASK_FIELDS[i]
+MASK_FIELDS = REQUIRED_STR + OPTIONAL_STR + list(REQUIRED_NUM) + OPTIONAL_NUM
+# O código de erro é um uint16: um campo além do 16º perderia o seu bit silenciosamente
+assert len(MASK_FIELDS) <= 16, "MASK_FIELDS excede os 16 bits do código de erro"
+
+# Tipos fixos na leitura do CSV: sem eles o pandas infere os tipos bloco a bloco, e uma
+# coluna de texto só com dígitos (ex: Fase=1) ou um Organizador '1e3' seriam aceitos ou
+# recusados conforme as outras linhas do bloco. Os campos de texto e os inteiros são lidos
+# como texto; nos campos float a leitura numérica e to_numeric chegam ao mesmo resultado.
+CSV_DTYPES = {
+    field: 'string'
+    for field in REQUIRED_STR + OPTIONAL_STR + [name for name, kind in REQUIRED_NUM.items() if kind is int]
+}
+
+# Texto aceito como inteiro sem consultar o Pydantic (ex: '42', ' -7 ')
+INT_LITERAL = r'\s*[+-]?[0-9]+\s*'
+
+# Número de linhas lidas e validadas por vez em validate_csv_chunks
+CHUNK_SIZE = 200_000
+# Número máximo de linhas válidas guardadas para visualização por validate_csv_chunks
+PREVIEW_ROWS = 1000
+# Número de registros suspeitos enviados ao Pydantic por chamada do TypeAdapter
+VALIDATION_BATCH_SIZE = 512
+
+
+def _numeric_values(series: pd.Series) -> np.ndarray:
+    """Converte a coluna para um array float64 do NumPy; valores não numéricos viram NaN."""
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _non_text_values(series: pd.Series) -> np.ndarray:
+    """
+    Retorna True nas células preenchidas que não são texto. O Pydantic não converte
+    números para 'str', e o pandas lê como numérica uma coluna de texto em que todos
+    os valores são dígitos (ex: Fase=1) quando não há tipos fixos (ver CSV_DTYPES).
+    """
+    if series.dtype == object:
+        # Colunas 'object' vindas do CSV costumam ser só texto; a checagem célula a
+        # célula só é feita quando o pandas detecta outros tipos misturados.
+        if pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+            return np.zeros(len(series), dtype=bool)
+        is_text = np.fromiter((isinstance(value, str) for value in series), dtype=bool, count=len(series))
+        return series.notna().to_numpy(dtype=bool) & ~is_text
+    if pd.api.types.is_string_dtype(series.dtype):
+        return np.zeros(len(series), dtype=bool)
+    return series.notna().to_numpy(dtype=bool)
+
+
+def _field_errors(df: pd.DataFrame, field: str) -> np.ndarray:
+    """Retorna um array booleano com True nas linhas em que o campo viola o contrato."""
+    if field not in df.columns:
+        # Colunas ausentes no CSV invalidam todas as linhas para o campo obrigatório
+        return np.full(len(df), field not in OPTIONAL_NUM + OPTIONAL_STR)
+
+    if field in REQUIRED_STR:
+        missing = (df[field].isna() | (df[field] == '')).to_numpy(dtype=bool)
+        return missing | _non_text_values(df[field])
+
+    if field in OPTIONAL_STR:
+        return _non_text_values(df[field])
+
+    values = _numeric_values(df[field])
+    if field in OPTIONAL_NUM:
+        # Vazio é permitido; o erro é um valor preenchido que não é numérico
+        return np.isnan(values) & df[field].notna().to_numpy(dtype=bool)
+
+    bad_num = np.isnan(values)
+    if REQUIRED_NUM[field] is int:
+        # Valores decimais (ex: 10.5) não são inteiros válidos
+        with np.errstate(invalid='ignore'):
+            bad_num |= np.mod(values, 1) != 0
+            # Floats a partir de 2**63 (ex: 1e19) não cabem no int do Pydantic (int_parsing_size)
+            bad_num |= np.abs(values) >= 2**63
+        if not pd.api.types.is_numeric_dtype(df[field].dtype):
+            # Em colunas de texto, o pandas aceita formas que o Pydantic recusa para 'int'
+            # (ex: '1e3'); qualquer texto que não seja um inteiro literal fica para o Pydantic.
+            is_int_literal = df[field].astype('string').str.fullmatch(INT_LITERAL).fillna(False)
+            bad_num |= (df[field].notna() & ~is_int_literal).to_numpy(dtype=bool)
+    if field in NON_NEGATIVE:
+        bad_num |= values < 0
+    return bad_num
+
+
+def build_error_flags(df: pd.DataFrame) -> np.ndarray:
+    """
+    Aplica as regras do contrato de dados coluna a coluna, com operações vetorizadas
+    sobre arrays do NumPy, e retorna um código de erro (uint16) por linha: o bit i
+    indica uma célula suspeita em MASK_FIELDS[i] e 0 indica uma linha sem suspeitas.
+
+    Os códigos são um pré-filtro: toda linha que o Pydantic rejeitaria é marcada aqui,
+    e apenas as linhas marcadas precisam passar pela validação completa.
+    """
+    flags = np.zeros(len(df), dtype=np.uint16)
+    for bit, field in enumerate(MASK_FIELDS):
+        flags |= _field_errors(df, field).astype(np.uint16) << bit
+    return flags
+
+
+def build_error_report(linhas: list, nomes: list, erros: list, totais: list) -> pd.DataFrame:
+    """
+    Monta o relatório de erros a partir de colunas já separadas, com os tipos definidos
+    de antemão (o pandas não precisa inferir o esquema registro a registro).
+    """
+    return pd.DataFrame({
+        "Linha_CSV": np.asarray(linhas, dtype='int32'),
+        "AdSet_Nome_Aprox": pd.array(nomes, dtype='string'),
+        "Primeiro_Erro_Detectado": pd.array(erros, dtype='string'),
+        "Total_Erros_Nesta_Linha": np.asarray(totais, dtype='int32'),
+    })
+
+
+def validate_data(df: pd.DataFrame):
+    """
+    Valida o DataFrame contra o modelo Pydantic (AdPerformanceRecord) e gera um
+    relatório detalhado de erros.
+
+    As regras do contrato são aplicadas primeiro de forma vetorizada (build_error_flags);
+    somente as linhas marcadas como suspeitas são validadas pelo Pydantic, em lotes de
+    VALIDATION_BATCH_SIZE (TypeAdapter), que fornece as mensagens de erro detalhadas.
+
+    Retorna:
+    - df_valid (pd.DataFrame): Linhas que passaram na validação, na ordem do CSV.
+    - error_report (pd.DataFrame): Relatório com uma linha por registro com erro.
+    """
+    # Colunas do relatório de erros, acumuladas separadamente (ver build_error_report)
+    linhas, nomes, erros, totais = [], [], [], []
+    
+    # Pré-filtro vetorizado: linhas com código de erro 0 são válidas
+    flags = build_error_flags(df)
+    valid_mask = flags == 0
+    
+    suspect_pos = np.flatnonzero(flags)
+    if suspect_pos.size == 0:
+        return df, build_error_report(linhas, nomes, erros, totais)
+    df_suspect = df.iloc[suspect_pos]
+    
+    # Células vazias (NaN) são omitidas para que o Pydantic as trate como ausentes:
+    # campos obrigatórios geram erro e campos opcionais assumem None.
+    records = [
+        {field: value for field, value in record.items() if pd.notna(value)}
+        for record in df_suspect.to_dict(orient='records')
+    ]
+    
+    # Valida as linhas suspeitas em lotes de VALIDATION_BATCH_SIZE; o 'loc' de cada erro é
+    # (posição no lote, campo), o que identifica a linha sem um loop de validação.
+    errors_by_row = defaultdict(list)
+    for start in range(0, len(records), VALIDATION_BATCH_SIZE):
+        try:
+            ADAPTER.validate_python(records[start:start + VALIDATION_BATCH_SIZE])
+        except ValidationError as e:
+            for error in e.errors():
+                row_pos, field_loc = start + error["loc"][0], error["loc"][1:]
+                errors_by_row[row_pos].append(format_pydantic_error({**error, "loc": field_loc}))
+    
+    for row_pos, index in enumerate(df_suspect.index):
+        formatted_errors = errors_by_row.get(row_pos)
+        if not formatted_errors:
+            # Marcada pelo pré-filtro, mas aceita pelo modelo
+            valid_mask[suspect_pos[row_pos]] = True
+            continue
+        
+        # Adiciona o registro de erro ao relatório.
+        # A linha CSV é o índice pandas + 2 (assumindo que o índice 0 é a linha 1 do cabeçalho)
+        linhas.append(index + 2)
+        nomes.append(records[row_pos].get('AdSet_name', 'N/A'))
+        erros.append(formatted_errors[0])
+        totais.append(len(formatted_errors))
+    
+    # Os registros válidos são as próprias linhas do DataFrame: nenhum objeto
+    # AdPerformanceRecord (nem dicionário por linha) é construído para elas.
+    # Mantém a ordem original do CSV nos registros válidos.
+    df_valid = df.loc[valid_mask]
+    
+    return df_valid, build_error_report(linhas, nomes, erros, totais)
+
+
+def validate_csv_chunks(csv_file, chunksize: int = CHUNK_SIZE, preview_rows: int = PREVIEW_ROWS):
+    """
+    Lê e valida o CSV (a partir da posição atual do arquivo) em blocos de `chunksize`
+    linhas com validate_data. Das linhas válidas, guarda apenas a contagem e as primeiras
+    `preview_rows` para visualização; assim a memória fica limitada ao bloco em
+    processamento mais o relatório de erros, que cresce com o número de linhas inválidas.
+    Os campos de texto e os inteiros são lidos com tipos fixos (CSV_DTYPES), de modo
+    que o resultado de cada linha não depende de quais linhas caem no mesmo bloco. O índice
+    do pandas continua entre os blocos, então a 'Linha_CSV' do relatório permanece correta.
+
+    Retorna:
+    - total_records (int): Total de linhas lidas.
+    - valid_count (int): Total de linhas que passaram na validação.
+    - valid_preview (pd.DataFrame): Primeiras `preview_rows` linhas válidas, na ordem do CSV.
+    - error_report (pd.DataFrame): Relatório com uma linha por registro com erro.
+    """
+    total_records = 0
+    valid_count = 0
+    preview_frames = []
+    error_reports = []
+    
+    with pd.read_csv(csv_file, chunksize=chunksize, dtype=CSV_DTYPES) as reader:
+        for chunk in reader:
+            chunk_valid, chunk_errors = validate_data(chunk)
+            total_records += len(chunk)
+            # Só copia linhas enquanto a visualização não estiver completa
+            preview_frames.append(chunk_valid.head(max(preview_rows - valid_count, 0)))
+            valid_count += len(chunk_valid)
+            error_reports.append(chunk_errors)
+    
+    if not error_reports:
+        return total_records, 0, pd.DataFrame(), build_error_report([], [], [], [])
+    return total_records, valid_count, pd.concat(preview_frames), pd.concat(error_reports, ignore_index=True)
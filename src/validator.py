@@ -1,9 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Union
 
 # --- CONTRATO DE DADOS ---
 
 class AdPerformanceRecord(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     Organizador: int = Field(..., description="ID numérico do organizador.")
     Ano_Mes: str = Field(..., description="Período do registro (Ex: '2024 | Março').")
     Dia_da_Semana: str = Field(..., description="Nome do dia da semana (Ex: 'Sexta-Feira').")
@@ -17,7 +19,4 @@ class AdPerformanceRecord(BaseModel):
     Conversions: Optional[Union[int, float]] = Field(None, description="Número de conversões.")
     Segmentação: Optional[str] = Field(None, description="Tipo de segmentação de público.")
     Tipo_de_Anúncio: str = Field(..., description="Tipo do criativo (Ex: 'Estático', 'Video').")
-    Fase: str = Field(..., description="Fase da campanha/lançamento.")
-
-    class Config:
-        extra = "ignore"
\ No newline at end of file
+    Fase: str = Field(..., description="Fase da campanha/lançamento.")
\ No newline at end of file
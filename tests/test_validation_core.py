@@ -0,0 +1,106 @@
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+sys.path.insert(0, str(SRC_DIR))
+
+from validation_core import CSV_DTYPES, validate_csv_chunks, validate_data  # noqa: E402
+from validator import AdPerformanceRecord  # noqa: E402
+
+HEADER = "Organizador,Ano_Mes,Dia_da_Semana,Tipo_Dia,Objetivo,Date,AdSet_name,Amount_spent,Link_clicks,Impressions,Conversions,Segmentação,Tipo_de_Anúncio,Fase"
+ROW = {
+    "Organizador": "240", "Ano_Mes": "2024 | Março", "Dia_da_Semana": "Sexta-Feira",
+    "Tipo_Dia": "Dia útil", "Objetivo": "Leads", "Date": "2024-03-01",
+    "AdSet_name": "topfunnel_v1", "Amount_spent": "3.64", "Link_clicks": "5",
+    "Impressions": "89", "Conversions": "", "Segmentação": "Interesses",
+    "Tipo_de_Anúncio": "Video", "Fase": "2º Lançamento | Leads",
+}
+
+
+def csv_text(*overrides: dict) -> str:
+    """Monta o texto de um CSV com uma linha por dicionário de valores sobrescritos em ROW."""
+    lines = [HEADER] + [",".join({**ROW, **override}[col] for col in HEADER.split(",")) for override in overrides]
+    return "\n".join(lines)
+
+
+def make_csv(*overrides: dict) -> pd.DataFrame:
+    """Lê com o pandas o CSV montado por csv_text."""
+    return pd.read_csv(io.StringIO(csv_text(*overrides)))
+
+
+def valid_rows_by_model(df: pd.DataFrame) -> list:
+    """Referência: valida cada linha individualmente com o modelo Pydantic."""
+    valid = []
+    for index, record in zip(df.index, df.to_dict(orient="records")):
+        try:
+            AdPerformanceRecord(**{field: value for field, value in record.items() if pd.notna(value)})
+            valid.append(index)
+        except ValidationError:
+            pass
+    return valid
+
+
+@pytest.mark.parametrize("df", [
+    # Colunas de texto lidas como numéricas pelo pandas (todos os valores são dígitos)
+    make_csv({"Fase": "1"}),
+    make_csv({"AdSet_name": "123"}),
+    make_csv({"Segmentação": "5"}),
+    # Organizador lido como texto por causa de um valor inválido em outra linha
+    make_csv({"Organizador": "1e3"}, {"Organizador": "x"}, {"Organizador": "10"}, {"Organizador": "1.0"}),
+    # Organizador float (por causa de uma célula vazia) com valores além do int64
+    make_csv({"Organizador": "1e19"}, {"Organizador": "-1e19"}, {"Organizador": ""}, {}),
+    # Valores numéricos inválidos e campos obrigatórios vazios
+    make_csv({"Amount_spent": "-1"}, {"Organizador": "10.5"}, {"Link_clicks": "abc"}, {"Date": ""}, {}),
+    pd.read_csv(DATA_DIR / "data.csv"),
+    pd.read_csv(DATA_DIR / "data_2025.csv"),
+], ids=["fase_int", "adset_int", "segmentacao_int", "organizador_text", "organizador_huge", "mixed_errors", "data", "data_2025"])
+def test_validate_data_matches_per_row_model(df):
+    df_valid, error_report = validate_data(df)
+
+    expected = valid_rows_by_model(df)
+    assert df_valid.index.tolist() == expected
+    assert sorted(error_report["Linha_CSV"].tolist()) == [index + 2 for index in df.index if index not in expected]
+
+
+@pytest.mark.parametrize("text", [
+    # Fase só com dígitos no primeiro bloco e texto no seguinte
+    csv_text({"Fase": "1"}, {"Fase": "2"}, {"Fase": "3"}, {}, {}),
+    # Organizador com '1e3' em um bloco numérico e em um bloco com texto inválido
+    csv_text({"Organizador": "1e3"}, {}, {}, {"Organizador": "1e3"}, {"Organizador": "x"}, {"Organizador": "1.0"}),
+    csv_text({"Amount_spent": "-1"}, {"Organizador": "10.5"}, {"Link_clicks": "abc"}, {"Date": ""}, {}, {"Fase": ""}, {}),
+    (DATA_DIR / "data.csv").read_text(encoding="utf-8"),
+    (DATA_DIR / "data_2025.csv").read_text(encoding="utf-8"),
+], ids=["fase_digits", "organizador_mixed", "mixed_errors", "data", "data_2025"])
+@pytest.mark.parametrize("chunksize", [2, 3, 7, 1000])
+def test_validate_csv_chunks_matches_single_read(text, chunksize):
+    df = pd.read_csv(io.StringIO(text), dtype=CSV_DTYPES)
+    df_valid, error_report = validate_data(df)
+    assert df_valid.index.tolist() == valid_rows_by_model(df)
+
+    total_records, valid_count, valid_preview, chunk_errors = validate_csv_chunks(
+        io.StringIO(text), chunksize=chunksize, preview_rows=2
+    )
+
+    assert total_records == len(df)
+    assert valid_count == len(df_valid)
+    # Só os campos de CSV_DTYPES têm tipo fixo; os floats continuam inferidos bloco a bloco
+    assert valid_preview.index.equals(df_valid.head(2).index)
+    fixed = [field for field in CSV_DTYPES if field in df.columns]
+    assert valid_preview[fixed].equals(df_valid.head(2)[fixed])
+    # Inclui a 'Linha_CSV', que deve seguir a numeração do arquivo inteiro
+    assert chunk_errors.equals(error_report)
+
+
+def test_validate_csv_chunks_header_only():
+    total_records, valid_count, valid_preview, error_report = validate_csv_chunks(io.StringIO(HEADER))
+
+    assert (total_records, valid_count) == (0, 0)
+    assert valid_preview.empty
+    assert error_report.empty
+    assert error_report.columns.tolist() == ["Linha_CSV", "AdSet_Nome_Aprox", "Primeiro_Erro_Detectado", "Total_Erros_Nesta_Linha"]